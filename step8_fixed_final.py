@@ -8,25 +8,264 @@ Dual-Phase Optimizer με ΣΩΣΤΗ κλίμακα επίδοσης:
 Κ1: Ισορροπία EP1 (άριστοι)
 Κ2: Ισορροπία EP5 (αδύναμοι), με FROZEN EP1
 
-Απαιτήσεις: Python 3.12+, openpyxl>=3.1.0
+Απαιτήσεις: Python 3.12+, openpyxl>=3.1.0, numpy
+Προαιρετικά: numba (JIT για τις σαρώσεις solos/pairs και το candidate scoring των solo swaps)
 """
 from __future__ import annotations
 
-import sys
 import argparse
-from pathlib import Path
+import logging
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
+from itertools import chain
+from typing import Dict, List, Set, Tuple, Optional, FrozenSet, Iterable, Iterator
 from math import ceil
 
+import numpy as np
 from openpyxl import load_workbook, Workbook
-from openpyxl.styles import Alignment, PatternFill, Font
+from openpyxl.styles import Alignment, PatternFill, Font, NamedStyle
 from openpyxl.worksheet.worksheet import Worksheet
 
+try:
+    from numba import njit
+    from numba.core.errors import NumbaError
+    HAVE_NUMBA = True
+    # Αποτυχίες του warmup που σημαίνουν "χωρίς JIT": typing/compile errors και numba cache που
+    # δεν φορτώνει (pickled με άλλο όνομα module → ModuleNotFoundError)
+    _WARMUP_ERRORS = (NumbaError, TypeError, ValueError, ImportError)
+except ImportError:  # numba είναι προαιρετικό - fallback σε καθαρή Python
+    HAVE_NUMBA = False
+    _WARMUP_ERRORS = ()
+    
+    def njit(*args, **kwargs):
+        """No-op αντικαταστάτης του numba.njit."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+log = logging.getLogger(__name__)
+
+
+# ========== ROW HELPERS ==========
+
+# Ν/Ο τιμές (ελληνικά ή λατινικά, κάθε πεζότητα) → κανονική μορφή, με ένα dict lookup ανά κελί
+_GREEK_MAP = {
+    'Ν': 'Ν', 'ν': 'Ν', 'N': 'Ν', 'n': 'Ν',
+    'Ο': 'Ο', 'ο': 'Ο', 'O': 'Ο', 'o': 'Ο',
+}
+
+# Στήλες του counts_arr (T, 8): ένα metric ανά στήλη
+METRIC_NAMES = ('boys', 'girls', 'greek_yes', 'ep1', 'ep2', 'ep3', 'ep4', 'ep5')
+METRIC_COL = {metric: col for col, metric in enumerate(METRIC_NAMES)}
+
+# Int κωδικοποίηση για τον optimizer (αντίστροφη μόνο στο export, μέσω Student)
+_GENDER_CODE = {'Α': 0, 'Κ': 1}  # άλλη τιμή → δικός της κωδικός ≥ 2 (βλ. _gender_codes)
+_GREEK_CODE = {'Ν': 1, 'Ο': 0}
+
+
+def _cell_raw(row: tuple, col: Optional[int]):
+    """Raw τιμή από row tuple του iter_rows(values_only=True) (0-based col)."""
+    if col is None or col >= len(row):
+        return None
+    return row[col]
+
+
+def _cell_text(row: tuple, col: Optional[int]) -> str:
+    """Τιμή κελιού ως stripped string ("" αν λείπει)."""
+    val = _cell_raw(row, col)
+    return str(val).strip() if val is not None else ""
+
+
+# ========== EXPORT STYLES ==========
+
+# Κοινά style objects για όλα τα sheets (μία κατασκευή ανά process)
+HDR_FONT = Font(bold=True)
+HDR_FILL_BLUE = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+HDR_FILL_GREEN = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
+CENTER = Alignment(horizontal='center')
+OK_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+BAD_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+
+
+# ========== JIT KERNELS ==========
+
+# Όριο spread ελληνικών για τα relaxed solo swaps (ίδιο στο kernel και στην Python σάρωση)
+RELAXED_GREEK_MAX = 4
+
+
+def _swap_improves(spread_delta, from_before, to_before, from_after, to_after, target):
+    """
+    Κανόνας βελτίωσης ενός swap, κοινός για το kernel και το _compute_improvement:
+    μικρότερο spread, αλλιώς λιγότερα τμήματα πάνω από το target, αλλιώς μικρότερο συνολικό excess.
+    Επιστρέφει (improves, delta_excess_teams, delta_total_excess).
+    """
+    excess_teams = ((1 if from_before > target else 0) + (1 if to_before > target else 0)
+                    - (1 if from_after > target else 0) - (1 if to_after > target else 0))
+    total_excess = (max(0, from_before - target) + max(0, to_before - target)
+                    - max(0, from_after - target) - max(0, to_after - target))
+    improves = (spread_delta > 0 or
+                (spread_delta == 0 and excess_teams > 0) or
+                (spread_delta == 0 and excess_teams == 0 and total_excess > 0))
+    return improves, excess_teams, total_excess
+
+
+# Ίδια συνάρτηση, JIT για χρήση μέσα στα kernels (η Python πλευρά καλεί την _swap_improves απευθείας)
+_nb_swap_improves = njit(cache=True)(_swap_improves)
+
+
+@njit(cache=True)
+def _spread_after(from_after, to_after, others_hi, others_lo):
+    """Spread αν αλλάξουν μόνο τα δύο τμήματα του swap."""
+    hi = max(from_after, to_after, others_hi)
+    lo = min(from_after, to_after, others_lo)
+    return hi - lo
+
+
+@njit(cache=True)
+def _score_solo_candidates(solos_max, solos_min, gender, greek, choice, main_choice, strict, target,
+                           before_from, before_to, others_hi, others_lo, spread_before):
+    """
+    Solo(max) ↔ Solo(min) candidates που βελτιώνουν το main metric.
+    
+    Τα per-metric arrays (before_from, before_to, others_hi, others_lo, spread_before)
+    έχουν σειρά [main, boys, girls, greek_yes]. Επιστρέφει
+    (out_idx, in_idx, delta_main, delta_gender, delta_greek).
+    """
+    n = solos_max.shape[0] * solos_min.shape[0]
+    out_idx = np.empty(n, dtype=np.int64)
+    in_idx = np.empty(n, dtype=np.int64)
+    delta_main = np.empty(n, dtype=np.int64)
+    delta_gender = np.empty(n, dtype=np.int64)
+    delta_greek = np.empty(n, dtype=np.int64)
+    spreads_after = np.empty(4, dtype=np.int64)
+    k = 0
+    
+    for a in range(solos_max.shape[0]):
+        s_out = solos_max[a]
+        for b in range(solos_min.shape[0]):
+            s_in = solos_min[b]
+            if gender[s_out] != gender[s_in]:
+                continue
+            if (greek[s_out] == greek[s_in]) != strict:
+                continue
+            
+            # Delta του from_team ανά metric (το to_team παίρνει το αντίθετο)
+            d_main = (1 if choice[s_in] == main_choice else 0) - (1 if choice[s_out] == main_choice else 0)
+            d_boys = (1 if gender[s_in] == 0 else 0) - (1 if gender[s_out] == 0 else 0)
+            d_girls = (1 if gender[s_in] == 1 else 0) - (1 if gender[s_out] == 1 else 0)
+            d_greek = (1 if greek[s_in] == 1 else 0) - (1 if greek[s_out] == 1 else 0)
+            deltas = (d_main, d_boys, d_girls, d_greek)
+            for m in range(4):
+                spreads_after[m] = _spread_after(before_from[m] + deltas[m], before_to[m] - deltas[m],
+                                                 others_hi[m], others_lo[m])
+            
+            spread_delta = spread_before[0] - spreads_after[0]
+            improves = _nb_swap_improves(spread_delta, before_from[0], before_to[0],
+                                         before_from[0] + d_main, before_to[0] - d_main, target)[0]
+            if not improves:
+                continue
+            if not strict and spreads_after[3] > RELAXED_GREEK_MAX:
+                continue
+            
+            out_idx[k] = s_out
+            in_idx[k] = s_in
+            delta_main[k] = spread_delta
+            delta_gender[k] = (spread_before[1] - spreads_after[1]) + (spread_before[2] - spreads_after[2])
+            delta_greek[k] = spread_before[3] - spreads_after[3]
+            k += 1
+    
+    return out_idx[:k], in_idx[:k], delta_main[:k], delta_gender[:k], delta_greek[:k]
+
+
+@njit(cache=True)
+def _nb_solos(team_id, choice_mask, team_of, locked, friends_indptr, friends_idx):
+    """Unlocked μαθητές του τμήματος με επίδοση στο choice_mask και χωρίς φίλο στο ίδιο τμήμα."""
+    out = np.empty(team_of.shape[0], dtype=np.int64)
+    k = 0
+    for sid in range(team_of.shape[0]):
+        if team_of[sid] != team_id or not choice_mask[sid] or locked[sid]:
+            continue
+        solo = True
+        for e in range(friends_indptr[sid], friends_indptr[sid + 1]):
+            if team_of[friends_idx[e]] == team_id:
+                solo = False
+                break
+        if solo:
+            out[k] = sid
+            k += 1
+    return out[:k]
+
+
+@njit(cache=True)
+def _nb_pairs(team_id, choice_mask, exclude_ep1, team_of, choice_arr, locked, upper_indptr, upper_idx):
+    """
+    Ζευγάρια φίλων (sid, fid) του τμήματος, ίδια σειρά και κανόνες με τη Python σάρωση:
+    τουλάχιστον ένας στο choice_mask, κανείς locked, κανείς EP1 αν exclude_ep1.
+    Διατρέχει μόνο τις upper ακμές (fid > sid) του friend_graph.
+    """
+    out = np.empty((upper_idx.shape[0], 2), dtype=np.int64)
+    seen = np.zeros(team_of.shape[0], dtype=np.bool_)
+    k = 0
+    for sid in range(team_of.shape[0]):
+        if team_of[sid] != team_id or seen[sid] or locked[sid]:
+            continue
+        for e in range(upper_indptr[sid], upper_indptr[sid + 1]):
+            fid = upper_idx[e]
+            if team_of[fid] != team_id or seen[fid] or locked[fid]:
+                continue
+            if not choice_mask[sid] and not choice_mask[fid]:
+                continue
+            if exclude_ep1 and (choice_arr[sid] == 1 or choice_arr[fid] == 1):
+                continue
+            out[k, 0] = sid
+            out[k, 1] = fid
+            k += 1
+            seen[sid] = True
+            seen[fid] = True
+    return out[:k]
+
+
+def _warmup_kernels() -> None:
+    """
+    Κλήση κάθε kernel με μικρά dummy arrays ίδιων dtypes με τις πραγματικές κλήσεις,
+    ώστε η μεταγλώττιση (ή το φόρτωμα από το cache) να γίνεται πριν από το πρώτο iteration.
+    """
+    ids = np.zeros(1, dtype=np.int64)
+    attrs = np.zeros(2, dtype=np.int8)
+    metric = np.zeros(4, dtype=np.int64)
+    mask = np.ones(2, dtype=np.bool_)
+    locked = np.zeros(2, dtype=np.bool_)
+    indptr = np.zeros(3, dtype=np.int64)
+    friends = np.zeros(0, dtype=np.int32)
+    _score_solo_candidates(ids, ids, attrs, attrs, attrs, 1, True, 2, metric, metric, metric, metric, metric)
+    _nb_solos(0, mask, attrs, locked, indptr, friends)
+    _nb_pairs(0, mask, False, attrs, attrs, locked, indptr, friends)
+
+
+_kernels_ready: Optional[bool] = None  # None: δεν έχει γίνει ακόμα warmup
+
+
+def _use_numba() -> bool:
+    """
+    True αν τα kernels είναι διαθέσιμα. Το πρώτο call κάνει το warmup (lazy, όχι στο import);
+    αν αποτύχει (π.χ. numba cache από module με άλλο όνομα) συνεχίζουμε σε καθαρή Python.
+    """
+    global _kernels_ready
+    if not HAVE_NUMBA:
+        return False
+    if _kernels_ready is None:
+        try:
+            _warmup_kernels()
+            _kernels_ready = True
+        except _WARMUP_ERRORS as exc:
+            log.warning("⚠️ Numba warmup απέτυχε (%s) - συνέχεια χωρίς JIT", exc)
+            _kernels_ready = False
+    return _kernels_ready
+
 
 # ========== DATACLASSES ==========
 
-@dataclass
+@dataclass(slots=True)
 class StudentData:
     """Δεδομένα μαθητή από source Excel."""
     name: str = ""
@@ -40,7 +279,7 @@ class StudentData:
     choice: int = 1  # 1-5: 1=άριστη, 5=χαμηλή
 
 
-@dataclass
+@dataclass(slots=True)
 class Student:
     """Student για optimizer."""
     name: str = ""
@@ -51,18 +290,64 @@ class Student:
     locked: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
+class ColumnMap:
+    """0-based θέσεις στηλών ενός sheet για τα row tuples του iter_rows (None = λείπει η στήλη)."""
+    name: Optional[int] = None
+    gender: Optional[int] = None
+    greek: Optional[int] = None
+    epidosi: Optional[int] = None
+    friends: Optional[int] = None
+    locked: Optional[int] = None
+    teacher_child: Optional[int] = None
+    calm: Optional[int] = None
+    special_needs: Optional[int] = None
+    
+    @classmethod
+    def from_headers(cls, headers: Dict[str, int]) -> "ColumnMap":
+        """Από το (1-based) αποτέλεσμα του _parse_headers."""
+        def col(*names: str) -> Optional[int]:
+            for hdr in names:
+                if hdr in headers:
+                    return headers[hdr] - 1
+            return None
+        
+        return cls(
+            name=col('ΟΝΟΜΑ'),
+            gender=col('ΦΥΛΟ'),
+            greek=col('ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ', 'ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ'),
+            epidosi=col('ΕΠΙΔΟΣΗ'),
+            friends=col('ΦΙΛΟΙ'),
+            locked=col('LOCKED'),
+            teacher_child=col('ΠΑΙΔΙ_ΕΚΠΑΙΔΕΥΤΙΚΟΥ'),
+            calm=col('ΖΩΗΡΟΣ'),
+            special_needs=col('ΙΔΙΑΙΤΕΡΟΤΗΤΑ'),
+        )
+
+
+@dataclass(slots=True)
 class SwapRecord:
-    """Καταγραφή swap για logging."""
+    """Καταγραφή swap για logging (students_out/in: student ids, βλ. UnifiedProcessor.id_to_name)."""
     swap_type: str
     from_team: str
-    students_out: List[str]
+    students_out: List[int]
     to_team: str
-    students_in: List[str]
+    students_in: List[int]
     delta_main: int
     delta_gender: int
     delta_greek: int
     priority: int
+    score_key: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Lexicographic score για το _select_best_swap (μεγαλύτερο = καλύτερο)
+        self.score_key = (
+            -self.priority,
+            self.delta_main,
+            self.delta_gender,
+            self.delta_greek,
+            -len(self.students_out)  # fewer moves
+        )
 
 
 # ========== MAIN PROCESSOR ==========
@@ -78,7 +363,49 @@ class UnifiedProcessor:
         self.students_data: Dict[str, StudentData] = {}
         self.teams_students: Dict[str, List[str]] = {}
         self.students: Dict[str, Student] = {}
-        self.teams: Dict[str, List[str]] = {}
+        # Ordered set ονομάτων ανά τμήμα (dict με τιμές None): O(1) μετακίνηση,
+        # η σειρά εισαγωγής είναι η σειρά εξαγωγής
+        self.teams: Dict[str, Dict[str, None]] = {}
+        
+        # Incremental counters: counts[team][metric] (boys, girls, greek_yes, ep1..ep5)
+        self.counts_arr = np.zeros((0, len(METRIC_NAMES)), dtype=np.int32)  # [team_id, METRIC_COL[metric]]
+        self.team_bits: Dict[str, int] = {}  # bitset (Python int) των student_ids ανά τμήμα
+        self.unlocked_by_team: Dict[str, Set[int]] = {}  # unlocked student_ids ανά τμήμα
+        self.unlocked_by_team_choice: Dict[Tuple[str, int], Set[int]] = {}  # ... και ανά (τμήμα, επίδοση)
+        self.debug_counters = False  # True: έλεγχος counters έναντι γραμμικής σάρωσης
+        self._extrema: Dict[int, Tuple[str, str]] = {}  # choice → (max_team, min_team)
+        
+        # SoA: ένα np.int8 array ανά attribute, indexed by student_id
+        self.team_names: List[str] = []
+        self.team_index: Dict[str, int] = {}
+        self.name_to_id: Dict[str, int] = {}
+        self.id_to_name: List[str] = []
+        self.people: List[Student] = []  # Student ανά student_id
+        self.choice_arr = np.zeros(0, dtype=np.int8)
+        self.gender_arr = np.zeros(0, dtype=np.int8)  # 0=Α, 1=Κ, ≥2 ένας κωδικός ανά άγνωστη τιμή
+        self.greek_arr = np.zeros(0, dtype=np.int8)   # 1=Ν, 0=Ο
+        self.profiles: List[Tuple[int, int]] = []  # (gender, greek) codes ανά student_id
+        self.team_arr = np.zeros(0, dtype=np.int8)
+        self.locked_arr = np.zeros(0, dtype=np.bool_)
+        self.metric_keys: List[Tuple[str, ...]] = []  # metrics στα οποία μετράει κάθε student_id
+        self.metric_masks: Dict[str, np.ndarray] = {}  # boolean mask ανά metric (σταθερά attributes)
+        self.metric_rows = np.zeros((0, len(METRIC_NAMES)), dtype=np.int32)  # συνεισφορά κάθε student_id στο counts_arr
+        self._choice_masks: Dict[FrozenSet[int], np.ndarray] = {}
+        # Version της κατανομής: αυξάνεται σε κάθε πραγματική μετακίνηση, τα memoized
+        # αποτελέσματα (snapshot, spreads, stats) ισχύουν μόνο για το version τους
+        self._state_version = 0
+        self._memo: Dict[str, Tuple[int, object]] = {}
+        
+        # Μη κατευθυνόμενος γράφος φιλίας (ανά student_id) + cache solos/pairs ανά τμήμα
+        self.friend_graph: List[List[int]] = []
+        self.friends_indptr = np.zeros(1, dtype=np.int64)  # CSR του friend_graph για τα kernels
+        self.friends_idx = np.zeros(0, dtype=np.int32)
+        self.upper_friends: List[List[int]] = []  # γείτονες με μεγαλύτερο id (κάθε ακμή μία φορά)
+        self.upper_indptr = np.zeros(1, dtype=np.int64)  # CSR των upper_friends
+        self.upper_idx = np.zeros(0, dtype=np.int32)
+        self.friend_bits: List[int] = []  # bitset φίλων ανά student_id: solo ⇔ friend_bits & team_bits == 0
+        self._solos_cache: Dict[str, Dict[FrozenSet[int], Tuple[int, ...]]] = {}
+        self._pairs_cache: Dict[str, Dict[Tuple[FrozenSet[int], bool], Tuple[Tuple[int, int], ...]]] = {}
         
         # Targets
         self.target_ep1 = 2  # Κ1: MAX 2 άριστοι ανά τμήμα
@@ -103,28 +430,29 @@ class UnifiedProcessor:
     
     def read_source_data(self, source_path: str) -> None:
         """Διάβασμα source Excel."""
-        wb = load_workbook(source_path, data_only=True)
+        wb = load_workbook(source_path, data_only=True, read_only=True)
         
         for sheet_name in wb.sheetnames:
             sheet = wb[sheet_name]
-            headers = self._parse_headers(sheet)
+            sheet.reset_dimensions()  # read-only: μην εμπιστεύεσαι τις αποθηκευμένες διαστάσεις
+            cmap = ColumnMap.from_headers(self._parse_headers(sheet))
             
-            if 'ΟΝΟΜΑ' not in headers:
+            if cmap.name is None:
                 continue
             
-            for row_idx in range(2, sheet.max_row + 1):
-                name = self._get_cell_value(sheet, row_idx, headers.get('ΟΝΟΜΑ'))
+            for row in sheet.iter_rows(min_row=2, values_only=True):
+                name = _cell_text(row, cmap.name)
                 if not name:
                     continue
                 
                 # ΦΙΛΟΙ
-                friends_str = self._get_cell_value(sheet, row_idx, headers.get('ΦΙΛΟΙ'))
+                friends_str = _cell_text(row, cmap.friends)
                 friends = [f.strip() for f in friends_str.split(',') if f.strip()] if friends_str else []
                 
                 # ΕΠΙΔΟΣΗ (1-5)
                 choice = 1
-                if 'ΕΠΙΔΟΣΗ' in headers:
-                    epidosi_raw = sheet.cell(row_idx, headers['ΕΠΙΔΟΣΗ']).value
+                if cmap.epidosi is not None:
+                    epidosi_raw = _cell_raw(row, cmap.epidosi)
                     if epidosi_raw is not None:
                         try:
                             choice = int(epidosi_raw)
@@ -134,28 +462,23 @@ class UnifiedProcessor:
                             choice = 1
                 
                 # ΦΥΛΟ
-                gender = self._get_cell_value(sheet, row_idx, headers.get('ΦΥΛΟ', '')) or 'Κ'
+                gender = _cell_text(row, cmap.gender) or 'Κ'
                 
                 # ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ
-                greek_col = headers.get('ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ') or headers.get('ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ')
-                if greek_col is None:
+                if cmap.greek is None:
                     self.warnings.append(f"Μαθητής {name}: Δεν βρέθηκε ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ - παραλείπεται")
                     continue
                 
-                greek_raw = self._get_cell_value(sheet, row_idx, greek_col) or "Ν"
-                greek_normalized = greek_raw.strip().upper()
-                if greek_normalized in ('Ν', 'N'):
-                    greek_knowledge = 'Ν'
-                elif greek_normalized in ('Ο', 'O'):
-                    greek_knowledge = 'Ο'
-                else:
+                greek_raw = _cell_text(row, cmap.greek) or "Ν"
+                greek_knowledge = _GREEK_MAP.get(greek_raw)
+                if greek_knowledge is None:
                     self.warnings.append(f"Unknown ΚΑΛΗ_ΓΝΩΣΗ '{greek_raw}' for {name}, defaulting to Ν")
                     greek_knowledge = 'Ν'
                 
                 # LOCKED flags
-                teacher_child = self._get_cell_value(sheet, row_idx, headers.get('ΠΑΙΔΙ_ΕΚΠΑΙΔΕΥΤΙΚΟΥ')) or 'Ο'
-                calm = self._get_cell_value(sheet, row_idx, headers.get('ΖΩΗΡΟΣ')) or 'Ο'
-                special_needs = self._get_cell_value(sheet, row_idx, headers.get('ΙΔΙΑΙΤΕΡΟΤΗΤΑ')) or 'Ο'
+                teacher_child = _cell_text(row, cmap.teacher_child) or 'Ο'
+                calm = _cell_text(row, cmap.calm) or 'Ο'
+                special_needs = _cell_text(row, cmap.special_needs) or 'Ο'
                 
                 self.students_data[name] = StudentData(
                     name=name,
@@ -190,50 +513,80 @@ class UnifiedProcessor:
                     sheet.cell(1, next_col, col)
                     headers[col] = next_col
             
+            cmap = ColumnMap.from_headers(headers)
             team_students = []
-            for row_idx in range(2, sheet.max_row + 1):
-                name = self._get_cell_value(sheet, row_idx, headers.get('ΟΝΟΜΑ'))
+            for row_idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+                name = _cell_text(row, cmap.name)
                 if not name or name not in self.students_data:
                     continue
                 
+                # sheet.cell είναι 1-based
                 sd = self.students_data[name]
-                sheet.cell(row_idx, headers['ΦΥΛΟ'], sd.gender)
-                sheet.cell(row_idx, headers['ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ'], sd.greek_knowledge)
-                sheet.cell(row_idx, headers['ΕΠΙΔΟΣΗ'], sd.choice)
+                sheet.cell(row_idx, cmap.gender + 1, sd.gender)
+                sheet.cell(row_idx, cmap.greek + 1, sd.greek_knowledge)
+                sheet.cell(row_idx, cmap.epidosi + 1, sd.choice)
+                sheet.cell(row_idx, cmap.friends + 1, ', '.join(sd.friends))
+                team_students.append(name)
+            
+            self.teams_students[sheet_name] = team_students
+            print(f"📝 {sheet_name}: {len(team_students)} μαθητές")
         
-        for sheet_name in wb.sheetnames:
+        wb.save(output_path)
+        wb.close()
+        print(f"✅ Filled: {output_path}")
+    
+    def fill_template_fast(self, template_path: str, output_path: str) -> None:
+        """
+        Γρήγορη συμπλήρωση με write-only workbook: κάθε sheet τμήματος ξαναγράφεται
+        ως σειρές τιμών. Χάνεται το styling και τα ΚΑΤΗΓΟΡΙΟΠΟΙΗΣΗ/SINGLE sheets,
+        άρα είναι για ενδιάμεσα αρχεία (π.χ. το temp filled του 'all' mode).
+        """
+        src = load_workbook(template_path, read_only=True)
+        wb = Workbook(write_only=True)
+        
+        for sheet_name in src.sheetnames:
             if sheet_name in ['ΚΑΤΗΓΟΡΙΟΠΟΙΗΣΗ', 'SINGLE']:
                 continue
             
-            sheet = wb[sheet_name]
+            sheet = src[sheet_name]
+            sheet.reset_dimensions()
+            header = list(next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ()))
             headers = self._parse_headers(sheet)
+            rows = list(sheet.iter_rows(min_row=2, values_only=True))
             
-            # Ensure columns exist
+            # Ensure columns exist - μετά την τελευταία χρησιμοποιημένη στήλη (όπως το sheet.max_column
+            # του fill_template), ώστε να μην πατηθούν τιμές γραμμών πέρα από το header
+            max_column = max([len(header)] + [len(row) for row in rows])
+            header += [None] * (max_column - len(header))
             required = ['ΟΝΟΜΑ', 'ΦΥΛΟ', 'ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ', 'ΕΠΙΔΟΣΗ', 'ΦΙΛΟΙ']
             for col in required:
                 if col not in headers:
-                    next_col = sheet.max_column + 1
-                    sheet.cell(1, next_col, col)
-                    headers[col] = next_col
+                    header.append(col)
+                    headers[col] = len(header)
+            cmap = ColumnMap.from_headers(headers)
+            
+            ws = wb.create_sheet(sheet_name)
+            ws.append(header)
             
             team_students = []
-            for row_idx in range(2, sheet.max_row + 1):
-                name = self._get_cell_value(sheet, row_idx, headers.get('ΟΝΟΜΑ'))
-                if not name or name not in self.students_data:
-                    continue
-                
-                sd = self.students_data[name]
-                sheet.cell(row_idx, headers['ΦΥΛΟ'], sd.gender)
-                sheet.cell(row_idx, headers['ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ'], sd.greek_knowledge)
-                sheet.cell(row_idx, headers['ΕΠΙΔΟΣΗ'], sd.choice)
-                sheet.cell(row_idx, headers['ΦΙΛΟΙ'], ', '.join(sd.friends))
-                team_students.append(name)
+            width = len(header)
+            for row in rows:
+                values = list(row) + [None] * (width - len(row))
+                name = _cell_text(values, cmap.name)
+                if name and name in self.students_data:
+                    sd = self.students_data[name]
+                    values[cmap.gender] = sd.gender
+                    values[cmap.greek] = sd.greek_knowledge
+                    values[cmap.epidosi] = sd.choice
+                    values[cmap.friends] = ', '.join(sd.friends)
+                    team_students.append(name)
+                ws.append(values)
             
             self.teams_students[sheet_name] = team_students
             print(f"📝 {sheet_name}: {len(team_students)} μαθητές")
         
+        src.close()
         wb.save(output_path)
-        wb.close()
         print(f"✅ Filled: {output_path}")
     
     def fill_target_excel(self, template_path: str, output_path: str) -> None:
@@ -244,45 +597,45 @@ class UnifiedProcessor:
     
     def load_filled_data(self, filled_path: str) -> None:
         """Φόρτωση filled data για optimization."""
-        wb = load_workbook(filled_path, data_only=True)
+        wb = load_workbook(filled_path, data_only=True, read_only=True)
         
         for sheet_name in wb.sheetnames:
             if sheet_name in ['ΚΑΤΗΓΟΡΙΟΠΟΙΗΣΗ', 'SINGLE']:
                 continue
             
             sheet = wb[sheet_name]
-            headers = self._parse_headers(sheet)
+            sheet.reset_dimensions()
+            cmap = ColumnMap.from_headers(self._parse_headers(sheet))
             
             team_list = []
-            for row_idx in range(2, sheet.max_row + 1):
-                name = self._get_cell_value(sheet, row_idx, headers.get('ΟΝΟΜΑ'))
+            for row in sheet.iter_rows(min_row=2, values_only=True):
+                name = _cell_text(row, cmap.name)
                 if not name:
                     continue
                 
                 # Parse attributes
                 choice = 1
-                if 'ΕΠΙΔΟΣΗ' in headers:
-                    ep_val = sheet.cell(row_idx, headers['ΕΠΙΔΟΣΗ']).value
+                if cmap.epidosi is not None:
+                    ep_val = _cell_raw(row, cmap.epidosi)
                     if ep_val is not None:
                         try:
                             choice = int(ep_val)
+                            if choice < 1 or choice > 5:
+                                choice = 1
                         except:
                             choice = 1
                 
-                gender = self._get_cell_value(sheet, row_idx, headers.get('ΦΥΛΟ')) or 'Κ'
+                gender = _cell_text(row, cmap.gender) or 'Κ'
                 
-                greek_col = headers.get('ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ') or headers.get('ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ')
-                greek_raw = self._get_cell_value(sheet, row_idx, greek_col) if greek_col else 'Ν'
-                greek_normalized = (greek_raw or 'Ν').strip().upper()
-                greek_knowledge = 'Ν' if greek_normalized in ('Ν', 'N') else 'Ο'
+                greek_raw = _cell_text(row, cmap.greek) or 'Ν'
+                greek_knowledge = 'Ν' if _GREEK_MAP.get(greek_raw) == 'Ν' else 'Ο'
                 
                 # Friends
-                friends_str = self._get_cell_value(sheet, row_idx, headers.get('ΦΙΛΟΙ'))
+                friends_str = _cell_text(row, cmap.friends)
                 friends = [f.strip() for f in friends_str.split(',') if f.strip()] if friends_str else []
                 
                 # Locked
-                locked_col = headers.get('LOCKED')
-                locked_val = self._get_cell_value(sheet, row_idx, locked_col) if locked_col else ""
+                locked_val = _cell_text(row, cmap.locked)
                 locked = (locked_val == "LOCKED")
                 
                 self.students[name] = Student(
@@ -295,9 +648,15 @@ class UnifiedProcessor:
                 )
                 team_list.append(name)
             
-            self.teams[sheet_name] = team_list
+            self.teams[sheet_name] = dict.fromkeys(team_list)
         
         wb.close()
+        self._build_arrays()
+        self._rebuild_counters()
+        self._rebuild_unlocked()
+        self._build_friend_graph()
+        for tn in self.teams:
+            self._rebuild_team_indices(tn)
         print(f"✅ Loaded {len(self.students)} μαθητές, {len(self.teams)} τμήματα")
     
     # ==================== PHASE 3: DUAL-PHASE OPTIMIZATION ====================
@@ -309,6 +668,7 @@ class UnifiedProcessor:
         - K2: EP5 (αδύναμοι), με EP1 frozen
         """
         print("\n🎯 Phase 3/3: Dual-phase optimization...")
+        _use_numba()  # JIT warmup εδώ, έξω από τα iterations
         
         # Dynamic target EP5 (optional)
         if dynamic_ep5:
@@ -319,9 +679,9 @@ class UnifiedProcessor:
         # K1: Optimize EP1 (άριστοι)
         self._optimize_k1_ep1()
         
-        # Snapshot K1 state
-        self.spreads_after_k1 = self._calculate_spreads()
-        self.cnt_ep1_after_k1 = {tn: self._count_choice(tn, 1) for tn in self.teams}
+        # Snapshot K1 state (αντίγραφο: το memoized dict μένει ίδιο object αν το K2 δεν κάνει swap)
+        self.spreads_after_k1 = self.calculate_spreads()
+        self.cnt_ep1_after_k1 = self._choice_counts(1)
         
         # Freeze EP1 before K2
         self._freeze_ep1_before_k2()
@@ -334,13 +694,14 @@ class UnifiedProcessor:
         self.max_iter_k1 = max_iterations
         self.max_iter_k2 = max_iterations
         self.optimize_dual_phase(dynamic_ep5=False)
-        # Return format expected by app: (swaps, spreads_after)
-        return (self.swaps_k1 + self.swaps_k2, self._calculate_spreads())
         
         print("\n🎉 Ολοκληρώθηκε!")
         print(f"  K1 swaps: {len(self.swaps_k1)}")
         print(f"  K2 swaps: {len(self.swaps_k2)}")
         print(f"  Total: {len(self.swaps_k1) + len(self.swaps_k2)}")
+        
+        # Return format expected by app: (swaps, spreads_after)
+        return (self.swaps_k1 + self.swaps_k2, self.calculate_spreads())
     
     def _optimize_k1_ep1(self) -> None:
         """Κύκλος 1: Optimize EP1 (άριστοι)."""
@@ -351,7 +712,7 @@ class UnifiedProcessor:
         print(f"   spread_ep1: {spreads['ep1']}")
         
         # Distribution
-        ep1_counts = {tn: self._count_choice(tn, 1) for tn in self.teams}
+        ep1_counts = self._choice_counts(1)
         for tn in sorted(self.teams.keys()):
             cnt = ep1_counts[tn]
             excess = max(0, cnt - self.target_ep1)
@@ -360,8 +721,9 @@ class UnifiedProcessor:
         
         # Main loop
         for iteration in range(1, self.max_iter_k1 + 1):
-            ep1_counts = {tn: self._count_choice(tn, 1) for tn in self.teams}
-            spread_current = max(ep1_counts.values()) - min(ep1_counts.values())
+            ep1_counts = self._choice_counts(1)
+            max_team, min_team = self._extreme_teams(1)
+            spread_current = ep1_counts[max_team] - ep1_counts[min_team]
             excess_teams = sum(1 for cnt in ep1_counts.values() if cnt > self.target_ep1)
             
             # Stop conditions
@@ -373,20 +735,17 @@ class UnifiedProcessor:
                 print(f"✅ spread_ep1 ≤ {self.spread_ep1_goal} στο iteration {iteration}")
                 break
             
-            # Find max/min teams
-            max_team = max(ep1_counts, key=ep1_counts.get)
-            min_team = min(ep1_counts, key=ep1_counts.get)
-            
             # Generate candidates
             candidates = self._generate_k1_swaps(max_team, min_team)
-            if not candidates:
-                print(f"⚠️ Δεν βρέθηκαν swaps στο iteration {iteration}")
+            first = next(candidates, None)
+            if first is None:
+                log.warning("⚠️ Δεν βρέθηκαν swaps στο iteration %d", iteration)
                 break
             
             # Select best
-            best = self._select_best_swap(candidates, main_metric='ep1')
+            best = self._select_best_swap(chain((first,), candidates), main_metric='ep1')
             if not best:
-                print(f"⚠️ Δεν βρέθηκε valid swap στο iteration {iteration}")
+                log.warning("⚠️ Δεν βρέθηκε valid swap στο iteration %d", iteration)
                 break
             
             # Apply
@@ -395,7 +754,7 @@ class UnifiedProcessor:
             
             # Progress
             if iteration % 10 == 0:
-                print(f"  Iteration {iteration}: {len(self.swaps_k1)} swaps, spread={spread_current}")
+                log.debug("  Iteration %d: %d swaps, spread=%d", iteration, len(self.swaps_k1), spread_current)
         
         # Final report K1
         print(f"\n📊 ΜΕΤΑ Κ1 (best effort):")
@@ -404,7 +763,7 @@ class UnifiedProcessor:
         print(f"   spread_ep1: {spreads['ep1']} → {spreads_after['ep1']}", end="")
         print(" ✅" if spreads_after['ep1'] <= self.spread_ep1_goal else " ⚠️")
         
-        ep1_counts_after = {tn: self._count_choice(tn, 1) for tn in self.teams}
+        ep1_counts_after = self._choice_counts(1)
         excess_teams_after = sum(1 for cnt in ep1_counts_after.values() if cnt > self.target_ep1)
         
         if spreads_after['ep1'] <= self.spread_ep1_goal:
@@ -424,22 +783,21 @@ class UnifiedProcessor:
     def _freeze_ep1_before_k2(self) -> None:
         """Freeze EP1 students before K2."""
         print("\n🔒 Freezing EP1 για Κ2...")
-        frozen_count = 0
+        # EP1 μαθητές + άμεσοι φίλοι τους (ο friend_graph έχει μόνο αμοιβαίες φιλίες, άρα είναι συμμετρικός)
+        ep1_ids = np.flatnonzero(self.choice_arr == 1).tolist()
+        frozen = set(ep1_ids)
+        for sid in ep1_ids:
+            frozen.update(self.friend_graph[sid])
+        
+        frozen_ids = sorted(frozen)
+        frozen_count = int(np.count_nonzero(~self.locked_arr[frozen_ids]))
+        for sid in frozen_ids:
+            self.people[sid].locked = True
+        self.locked_arr[frozen_ids] = True
+        self._rebuild_unlocked()
         
-        for student in self.students.values():
-            if student.choice == 1:
-                student.locked = True
-                frozen_count += 1
-            
-            # Lock pairs with EP1
-            if student.friends:
-                for friend_name in student.friends:
-                    if friend_name in self.students:
-                        friend = self.students[friend_name]
-                        if student.choice == 1 or friend.choice == 1:
-                            student.locked = True
-                            friend.locked = True
-                            frozen_count += 1
+        for tn in self.teams:
+            self._rebuild_team_indices(tn)
         
         print(f"   Frozen: {frozen_count} μαθητές")
     
@@ -451,7 +809,7 @@ class UnifiedProcessor:
         print(f"📊 ΠΡΙΝ Κ2:")
         print(f"   spread_ep5: {spreads['ep5']}")
         
-        ep5_counts = {tn: self._count_choice(tn, 5) for tn in self.teams}
+        ep5_counts = self._choice_counts(5)
         for tn in sorted(self.teams.keys()):
             cnt = ep5_counts[tn]
             excess = max(0, cnt - self.target_ep5)
@@ -460,8 +818,9 @@ class UnifiedProcessor:
         
         # Main loop
         for iteration in range(1, self.max_iter_k2 + 1):
-            ep5_counts = {tn: self._count_choice(tn, 5) for tn in self.teams}
-            spread_current = max(ep5_counts.values()) - min(ep5_counts.values())
+            ep5_counts = self._choice_counts(5)
+            max_team, min_team = self._extreme_teams(5)
+            spread_current = ep5_counts[max_team] - ep5_counts[min_team]
             excess_teams = sum(1 for cnt in ep5_counts.values() if cnt > self.target_ep5)
             
             # Stop conditions
@@ -473,26 +832,18 @@ class UnifiedProcessor:
                 print(f"✅ spread_ep5 ≤ {self.spread_ep5_goal} στο iteration {iteration}")
                 break
             
-            # Find max/min teams
-            max_team = max(ep5_counts, key=ep5_counts.get)
-            min_team = min(ep5_counts, key=ep5_counts.get)
-            
             # Generate candidates
             candidates = self._generate_k2_swaps(max_team, min_team)
-            if not candidates:
-                print(f"⚠️ Δεν βρέθηκαν swaps στο iteration {iteration}")
-                break
-            
-            # Safety filter
-            safe_candidates = [c for c in candidates if self._is_safe_for_k2(c)]
-            if not safe_candidates:
-                print(f"⚠️ Δεν βρέθηκαν safe swaps στο iteration {iteration}")
+            first = next(candidates, None)
+            if first is None:
+                log.warning("⚠️ Δεν βρέθηκαν swaps στο iteration %d", iteration)
                 break
             
-            # Select best
+            # Safety filter + select best
+            safe_candidates = (c for c in chain((first,), candidates) if self._is_safe_for_k2(c))
             best = self._select_best_swap(safe_candidates, main_metric='ep5')
             if not best:
-                print(f"⚠️ Δεν βρέθηκε valid swap στο iteration {iteration}")
+                log.warning("⚠️ Δεν βρέθηκαν safe swaps στο iteration %d", iteration)
                 break
             
             # Apply
@@ -504,7 +855,7 @@ class UnifiedProcessor:
             
             # Progress
             if iteration % 10 == 0:
-                print(f"  Iteration {iteration}: {len(self.swaps_k2)} swaps, spread={spread_current}")
+                log.debug("  Iteration %d: %d swaps, spread=%d", iteration, len(self.swaps_k2), spread_current)
         
         # Final report K2
         print(f"\n📊 ΤΕΛΙΚΑ (best effort):")
@@ -515,7 +866,7 @@ class UnifiedProcessor:
         print(f"   spread_ep5: {spreads['ep5']} → {spreads_final['ep5']}", end="")
         print(" ✅" if spreads_final['ep5'] <= self.spread_ep5_goal else " ⚠️")
         
-        ep5_counts_final = {tn: self._count_choice(tn, 5) for tn in self.teams}
+        ep5_counts_final = self._choice_counts(5)
         excess_teams_final = sum(1 for cnt in ep5_counts_final.values() if cnt > self.target_ep5)
         
         if spreads_final['ep5'] <= self.spread_ep5_goal:
@@ -533,26 +884,19 @@ class UnifiedProcessor:
     def _is_safe_for_k2(self, swap: SwapRecord) -> bool:
         """Check αν swap είναι safe για K2 (δεν αλλάζει EP1)."""
         # Check 1: Locked students
-        for name in swap.students_out + swap.students_in:
-            if self.students[name].locked:
+        people = self.people
+        for sid in chain(swap.students_out, swap.students_in):
+            if people[sid].locked:
                 return False
         
-        # Check 2: EP1 counts preservation
-        cnt_ep1_before = {tn: self._count_choice(tn, 1) for tn in self.teams}
-        
-        # Simulate
-        self._apply_swap(swap)
-        cnt_ep1_after = {tn: self._count_choice(tn, 1) for tn in self.teams}
-        
-        # Undo
-        self._undo_swap(swap)
-        
-        # Compare
-        return cnt_ep1_before == cnt_ep1_after
+        # Check 2: EP1 counts preservation - ίδιο πλήθος EP1 σε out και in
+        out_ep1 = sum(1 for sid in swap.students_out if people[sid].choice == 1)
+        in_ep1 = sum(1 for sid in swap.students_in if people[sid].choice == 1)
+        return out_ep1 == in_ep1
     
     def _validate_k2_invariants(self) -> None:
         """Validate ότι K1 results intact."""
-        current_cnt = {tn: self._count_choice(tn, 1) for tn in self.teams}
+        current_cnt = self._choice_counts(1)
         
         for tn in self.teams:
             if current_cnt[tn] != self.cnt_ep1_after_k1[tn]:
@@ -561,190 +905,247 @@ class UnifiedProcessor:
     
     # ==================== SWAP GENERATION ====================
     
-    def _generate_k1_swaps(self, max_team: str, min_team: str) -> List[SwapRecord]:
-        """Generate swaps K1: EP1 (max) ↔ EP2/3/4/5 (min)."""
-        candidates = []
+    def _generate_k1_swaps(self, max_team: str, min_team: str) -> Iterator[SwapRecord]:
+        """Generate swaps K1: EP1 (max) ↔ EP2/3/4/5 (min), lazily σε σειρά priority."""
         
         # Priority 1: Solo strict
         solos_max = self._get_solos_with_choice(max_team, [1])
         solos_min = self._get_solos_with_choice(min_team, [2, 3, 4, 5])
         
-        for s_max in solos_max:
-            for s_min in solos_min:
-                if (self.students[s_max].gender == self.students[s_min].gender and
-                    self.students[s_max].greek_knowledge == self.students[s_min].greek_knowledge):
-                    
-                    improvement = self._compute_improvement_k1(max_team, [s_max], min_team, [s_min])
-                    if improvement['improves']:
-                        candidates.append(SwapRecord(
-                            swap_type="Solo(EP1)↔Solo(low)-Strict",
-                            from_team=max_team,
-                            students_out=[s_max],
-                            to_team=min_team,
-                            students_in=[s_min],
-                            delta_main=improvement['delta_spread_ep1'],
-                            delta_gender=improvement['delta_boys'] + improvement['delta_girls'],
-                            delta_greek=improvement['delta_greek'],
-                            priority=1
-                        ))
+        for s_max, s_min, d_main, d_gender, d_greek in self._solo_candidates(
+                1, self.target_ep1, max_team, min_team, solos_max, solos_min, strict=True):
+            yield SwapRecord(
+                swap_type="Solo(EP1)↔Solo(low)-Strict",
+                from_team=max_team,
+                students_out=[s_max],
+                to_team=min_team,
+                students_in=[s_min],
+                delta_main=d_main,
+                delta_gender=d_gender,
+                delta_greek=d_greek,
+                priority=1
+            )
         
         # Priority 2: Pair strict
         pairs_max = self._get_pairs_with_choice(max_team, [1])
         pairs_min = self._get_pairs_with_choice(min_team, [2, 3, 4, 5])
         
-        for (a_max, b_max) in pairs_max:
-            for (a_min, b_min) in pairs_min:
-                if self._pairs_match_strict(a_max, b_max, a_min, b_min):
-                    improvement = self._compute_improvement_k1(max_team, [a_max, b_max], min_team, [a_min, b_min])
-                    if improvement['improves']:
-                        candidates.append(SwapRecord(
-                            swap_type="Pair(high)↔Pair(low)-Strict",
-                            from_team=max_team,
-                            students_out=[a_max, b_max],
-                            to_team=min_team,
-                            students_in=[a_min, b_min],
-                            delta_main=improvement['delta_spread_ep1'],
-                            delta_gender=improvement['delta_boys'] + improvement['delta_girls'],
-                            delta_greek=improvement['delta_greek'],
-                            priority=2
-                        ))
+        # argwhere σε row-major σειρά: ίδια σειρά candidates με το διπλό loop pairs_max × pairs_min
+        for i, j in np.argwhere(self._match_strict_matrix(pairs_max, pairs_min)).tolist():
+            (a_max, b_max), (a_min, b_min) = pairs_max[i], pairs_min[j]
+            # Ίδιο πλήθος EP1 μέσα/έξω: το main metric δεν αλλάζει, άρα δεν υπάρχει improvement
+            if self._main_delta(1, (a_max, b_max), (a_min, b_min)) == 0:
+                continue
+            improvement = self._compute_improvement_k1(max_team, [a_max, b_max], min_team, [a_min, b_min])
+            if improvement['improves']:
+                yield SwapRecord(
+                    swap_type="Pair(high)↔Pair(low)-Strict",
+                    from_team=max_team,
+                    students_out=[a_max, b_max],
+                    to_team=min_team,
+                    students_in=[a_min, b_min],
+                    delta_main=improvement['delta_spread_ep1'],
+                    delta_gender=improvement['delta_boys'] + improvement['delta_girls'],
+                    delta_greek=improvement['delta_greek'],
+                    priority=2
+                )
         
         # Priority 3: Solo relaxed
-        for s_max in solos_max:
-            for s_min in solos_min:
-                if self.students[s_max].gender == self.students[s_min].gender:
-                    if self.students[s_max].greek_knowledge == self.students[s_min].greek_knowledge:
-                        continue  # P1 already covered
-                    
-                    improvement = self._compute_improvement_k1(max_team, [s_max], min_team, [s_min])
-                    if improvement['improves'] and improvement['spread_greek_after'] <= 4:
-                        candidates.append(SwapRecord(
-                            swap_type="Solo(EP1)↔Solo(low)-Relaxed",
-                            from_team=max_team,
-                            students_out=[s_max],
-                            to_team=min_team,
-                            students_in=[s_min],
-                            delta_main=improvement['delta_spread_ep1'],
-                            delta_gender=improvement['delta_boys'] + improvement['delta_girls'],
-                            delta_greek=improvement['delta_greek'],
-                            priority=3
-                        ))
-        
-        return candidates
+        # Ίδιο φύλο, αντίθετη γνώση ελληνικών (το strict καλύφθηκε στο P1)
+        for s_max, s_min, d_main, d_gender, d_greek in self._solo_candidates(
+                1, self.target_ep1, max_team, min_team, solos_max, solos_min, strict=False):
+            yield SwapRecord(
+                swap_type="Solo(EP1)↔Solo(low)-Relaxed",
+                from_team=max_team,
+                students_out=[s_max],
+                to_team=min_team,
+                students_in=[s_min],
+                delta_main=d_main,
+                delta_gender=d_gender,
+                delta_greek=d_greek,
+                priority=3
+            )
     
-    def _generate_k2_swaps(self, max_team: str, min_team: str) -> List[SwapRecord]:
-        """Generate swaps K2: EP5 (max) ↔ EP2/3/4 (min)."""
-        candidates = []
+    def _generate_k2_swaps(self, max_team: str, min_team: str) -> Iterator[SwapRecord]:
+        """Generate swaps K2: EP5 (max) ↔ EP2/3/4 (min), lazily σε σειρά priority."""
         
         # Priority 1: Solo strict
         solos_max = self._get_solos_with_choice(max_team, [5])
         solos_min = self._get_solos_with_choice(min_team, [2, 3, 4])  # NO EP1!
         
-        for s_max in solos_max:
-            for s_min in solos_min:
-                if (self.students[s_max].gender == self.students[s_min].gender and
-                    self.students[s_max].greek_knowledge == self.students[s_min].greek_knowledge):
-                    
-                    improvement = self._compute_improvement_k2(max_team, [s_max], min_team, [s_min])
-                    if improvement['improves']:
-                        candidates.append(SwapRecord(
-                            swap_type="Solo(EP5)↔Solo(mid)-Strict",
-                            from_team=max_team,
-                            students_out=[s_max],
-                            to_team=min_team,
-                            students_in=[s_min],
-                            delta_main=improvement['delta_spread_ep5'],
-                            delta_gender=improvement['delta_boys'] + improvement['delta_girls'],
-                            delta_greek=improvement['delta_greek'],
-                            priority=1
-                        ))
+        for s_max, s_min, d_main, d_gender, d_greek in self._solo_candidates(
+                5, self.target_ep5, max_team, min_team, solos_max, solos_min, strict=True):
+            yield SwapRecord(
+                swap_type="Solo(EP5)↔Solo(mid)-Strict",
+                from_team=max_team,
+                students_out=[s_max],
+                to_team=min_team,
+                students_in=[s_min],
+                delta_main=d_main,
+                delta_gender=d_gender,
+                delta_greek=d_greek,
+                priority=1
+            )
         
         # Priority 2: Pair strict
         pairs_max = self._get_pairs_with_choice(max_team, [5], exclude_ep1=True)
         pairs_min = self._get_pairs_with_choice(min_team, [2, 3, 4], exclude_ep1=True)
         
-        for (a_max, b_max) in pairs_max:
-            for (a_min, b_min) in pairs_min:
-                if self._pairs_match_strict(a_max, b_max, a_min, b_min):
-                    improvement = self._compute_improvement_k2(max_team, [a_max, b_max], min_team, [a_min, b_min])
-                    if improvement['improves']:
-                        candidates.append(SwapRecord(
-                            swap_type="Pair(low)↔Pair(mid)-Strict",
-                            from_team=max_team,
-                            students_out=[a_max, b_max],
-                            to_team=min_team,
-                            students_in=[a_min, b_min],
-                            delta_main=improvement['delta_spread_ep5'],
-                            delta_gender=improvement['delta_boys'] + improvement['delta_girls'],
-                            delta_greek=improvement['delta_greek'],
-                            priority=2
-                        ))
+        # argwhere σε row-major σειρά: ίδια σειρά candidates με το διπλό loop pairs_max × pairs_min
+        for i, j in np.argwhere(self._match_strict_matrix(pairs_max, pairs_min)).tolist():
+            (a_max, b_max), (a_min, b_min) = pairs_max[i], pairs_min[j]
+            # Ίδιο πλήθος EP5 μέσα/έξω: το main metric δεν αλλάζει, άρα δεν υπάρχει improvement
+            if self._main_delta(5, (a_max, b_max), (a_min, b_min)) == 0:
+                continue
+            improvement = self._compute_improvement_k2(max_team, [a_max, b_max], min_team, [a_min, b_min])
+            if improvement['improves']:
+                yield SwapRecord(
+                    swap_type="Pair(low)↔Pair(mid)-Strict",
+                    from_team=max_team,
+                    students_out=[a_max, b_max],
+                    to_team=min_team,
+                    students_in=[a_min, b_min],
+                    delta_main=improvement['delta_spread_ep5'],
+                    delta_gender=improvement['delta_boys'] + improvement['delta_girls'],
+                    delta_greek=improvement['delta_greek'],
+                    priority=2
+                )
         
         # Priority 3: Solo relaxed
-        for s_max in solos_max:
-            for s_min in solos_min:
-                if self.students[s_max].gender == self.students[s_min].gender:
-                    if self.students[s_max].greek_knowledge == self.students[s_min].greek_knowledge:
-                        continue
-                    
-                    improvement = self._compute_improvement_k2(max_team, [s_max], min_team, [s_min])
-                    if improvement['improves'] and improvement['spread_greek_after'] <= 4:
-                        candidates.append(SwapRecord(
-                            swap_type="Solo(EP5)↔Solo(mid)-Relaxed",
-                            from_team=max_team,
-                            students_out=[s_max],
-                            to_team=min_team,
-                            students_in=[s_min],
-                            delta_main=improvement['delta_spread_ep5'],
-                            delta_gender=improvement['delta_boys'] + improvement['delta_girls'],
-                            delta_greek=improvement['delta_greek'],
-                            priority=3
-                        ))
-        
-        return candidates
+        # Ίδιο φύλο, αντίθετη γνώση ελληνικών (το strict καλύφθηκε στο P1)
+        for s_max, s_min, d_main, d_gender, d_greek in self._solo_candidates(
+                5, self.target_ep5, max_team, min_team, solos_max, solos_min, strict=False):
+            yield SwapRecord(
+                swap_type="Solo(EP5)↔Solo(mid)-Relaxed",
+                from_team=max_team,
+                students_out=[s_max],
+                to_team=min_team,
+                students_in=[s_min],
+                delta_main=d_main,
+                delta_gender=d_gender,
+                delta_greek=d_greek,
+                priority=3
+            )
     
-    def _get_solos_with_choice(self, team: str, choices: List[int]) -> List[str]:
-        """Get solo students με επίδοση στο choices."""
-        solos = []
-        for name in self.teams[team]:
-            s = self.students[name]
-            if s.locked:
-                continue
-            if s.choice not in choices:
-                continue
-            
-            # Check if solo (no friends in same team)
-            has_friend_here = False
-            for friend_name in s.friends:
-                if friend_name in self.teams[team]:
-                    has_friend_here = True
-                    break
+    def _solo_candidates(self, main_choice: int, target: int, max_team: str, min_team: str,
+                         solos_max: Tuple[int, ...], solos_min: Tuple[int, ...],
+                         strict: bool) -> List[Tuple[int, int, int, int, int]]:
+        """
+        Solo↔Solo swaps που βελτιώνουν: (s_out, s_in, delta_main, delta_gender, delta_greek).
+        strict: ίδιο φύλο + ίδια γνώση ελληνικών, αλλιώς ίδιο φύλο + αντίθετη γνώση
+        με spread_greek_after ≤ 4.
+        """
+        if not solos_max or not solos_min:
+            return []
+        
+        if _use_numba():
+            metrics = (f'ep{main_choice}', 'boys', 'girls', 'greek_yes')
+            i, j = self.team_index[max_team], self.team_index[min_team]
+            snapshot = self._metric_snapshot()
+            before_from, before_to, others_hi, others_lo, spread_before = [], [], [], [], []
+            for metric in metrics:
+                vals, order = snapshot[metric]
+                others = [vals[t] for t in order if t != i and t != j]
+                before_from.append(vals[i])
+                before_to.append(vals[j])
+                # Χωρίς άλλα τμήματα (2 τμήματα): ουδέτερα sentinels
+                others_hi.append(others[-1] if others else -len(self.people))
+                others_lo.append(others[0] if others else len(self.people) * 2)
+                spread_before.append(vals[order[-1]] - vals[order[0]])
             
-            if not has_friend_here:
-                solos.append(name)
+            result = _score_solo_candidates(
+                np.array(solos_max, dtype=np.int64), np.array(solos_min, dtype=np.int64),
+                self.gender_arr, self.greek_arr, self.choice_arr, main_choice, strict, target,
+                np.array(before_from, dtype=np.int64), np.array(before_to, dtype=np.int64),
+                np.array(others_hi, dtype=np.int64), np.array(others_lo, dtype=np.int64),
+                np.array(spread_before, dtype=np.int64),
+            )
+            return list(zip(*(arr.tolist() for arr in result)))
         
-        return solos
+        candidates = []
+        solos_min_by_profile = self._bucket_by_profile(solos_min)
+        for s_max in solos_max:
+            gender, greek = self._profile(s_max)
+            profile = (gender, greek if strict else 1 - greek)
+            for s_min in solos_min_by_profile.get(profile, ()):
+                improvement = self._compute_improvement(main_choice, target, max_team, [s_max], min_team, [s_min])
+                if not improvement['improves']:
+                    continue
+                if not strict and improvement['spread_greek_after'] > RELAXED_GREEK_MAX:
+                    continue
+                candidates.append((s_max, s_min,
+                                   improvement[f'delta_spread_ep{main_choice}'],
+                                   improvement['delta_boys'] + improvement['delta_girls'],
+                                   improvement['delta_greek']))
+        return candidates
     
-    def _get_pairs_with_choice(self, team: str, choices: List[int], exclude_ep1: bool = False) -> List[Tuple[str, str]]:
-        """Get friend pairs με τουλάχιστον ένα choice στο choices."""
+    def _get_solos_with_choice(self, team: str, choices: List[int]) -> Tuple[int, ...]:
+        """Get solo students (ids) με επίδοση στο choices (cached ανά τμήμα)."""
+        key = frozenset(choices)
+        cache = self._solos_cache[team]
+        if key not in cache:
+            cache[key] = self._scan_solos(team, key)
+        return cache[key]
+    
+    def _get_pairs_with_choice(self, team: str, choices: List[int],
+                               exclude_ep1: bool = False) -> Tuple[Tuple[int, int], ...]:
+        """Get friend pairs (ids) με τουλάχιστον ένα choice στο choices (cached ανά τμήμα)."""
+        key = (frozenset(choices), exclude_ep1)
+        cache = self._pairs_cache[team]
+        if key not in cache:
+            cache[key] = self._scan_pairs(team, key[0], exclude_ep1)
+        return cache[key]
+    
+    def _choice_mask(self, choices: FrozenSet[int]) -> np.ndarray:
+        """Boolean mask 'επίδοση ∈ choices' (cached ανά σύνολο choices)."""
+        mask = self._choice_masks.get(choices)
+        if mask is None:
+            mask = np.zeros(len(self.people), dtype=np.bool_)
+            for choice in choices:
+                mask |= self.metric_masks[f'ep{choice}']
+            self._choice_masks[choices] = mask
+        return mask
+    
+    def _scan_solos(self, team: str, choices: FrozenSet[int]) -> Tuple[int, ...]:
+        """Σάρωση τμήματος για solo μαθητές (χωρίς φίλο στο ίδιο τμήμα)."""
+        if _use_numba():
+            solos = _nb_solos(self.team_index[team], self._choice_mask(choices), self.team_arr,
+                              self.locked_arr, self.friends_indptr, self.friends_idx)
+            return tuple(solos.tolist())
+        
+        # Μόνο τα buckets των ζητούμενων επιδόσεων, όχι όλο το τμήμα
+        members = self.team_bits[team]
+        candidates = chain.from_iterable(self.unlocked_by_team_choice[(team, c)] for c in choices)
+        return tuple(sid for sid in sorted(candidates) if not self.friend_bits[sid] & members)
+    
+    def _scan_pairs(self, team: str, choices: FrozenSet[int], exclude_ep1: bool) -> Tuple[Tuple[int, int], ...]:
+        """Σάρωση τμήματος για ζευγάρια φίλων."""
+        if _use_numba():
+            pairs = _nb_pairs(self.team_index[team], self._choice_mask(choices), exclude_ep1, self.team_arr,
+                              self.choice_arr, self.locked_arr, self.upper_indptr, self.upper_idx)
+            return tuple(map(tuple, pairs.tolist()))
+        
+        unlocked = self.unlocked_by_team[team]
+        members = self.team_bits[team]
         pairs = []
         seen = set()
         
-        for name in self.teams[team]:
-            if name in seen:
+        for sid in sorted(unlocked):
+            if sid in seen:
                 continue
             
-            s = self.students[name]
-            if s.locked:
+            # Κανένας φίλος στο τμήμα: ένα AND στα bitsets αντί για σάρωση των φίλων
+            if not self.friend_bits[sid] & members:
                 continue
             
-            for friend_name in s.friends:
-                if friend_name not in self.teams[team] or friend_name in seen:
+            # Μόνο upper ακμές (fid > sid): το (fid, sid) με fid < sid κρίθηκε ήδη όταν σαρώθηκε το fid
+            s = self.people[sid]
+            for fid in self.upper_friends[sid]:
+                # Ο φίλος πρέπει να είναι στο τμήμα και unlocked
+                if fid not in unlocked or fid in seen:
                     continue
                 
-                friend = self.students[friend_name]
-                if friend.locked:
-                    continue
+                friend = self.people[fid]
                 
                 # Check if at least one in target choices
                 if s.choice not in choices and friend.choice not in choices:
@@ -754,237 +1155,364 @@ class UnifiedProcessor:
                 if exclude_ep1 and (s.choice == 1 or friend.choice == 1):
                     continue
                 
-                pairs.append((name, friend_name))
-                seen.add(name)
-                seen.add(friend_name)
+                pairs.append((sid, fid))
+                seen.add(sid)
+                seen.add(fid)
         
-        return pairs
+        return tuple(pairs)
     
-    def _pairs_match_strict(self, a1: str, b1: str, a2: str, b2: str) -> bool:
-        """Check αν 2 pairs match strictly (gender + greek)."""
-        s_a1, s_b1 = self.students[a1], self.students[b1]
-        s_a2, s_b2 = self.students[a2], self.students[b2]
-        
-        return (s_a1.gender == s_a2.gender and
-                s_b1.gender == s_b2.gender and
-                s_a1.greek_knowledge == s_a2.greek_knowledge and
-                s_b1.greek_knowledge == s_b2.greek_knowledge)
+    def _rebuild_team_indices(self, team: str) -> None:
+        """Ακύρωση cache solos/pairs του τμήματος (ξαναγεμίζει στο επόμενο access)."""
+        self._solos_cache[team] = {}
+        self._pairs_cache[team] = {}
+    
+    def _build_friend_graph(self) -> None:
+        """
+        Γράφος φιλίας ανά student_id με μόνο αμοιβαίες φιλίες: ακμή sid–fid μόνο αν
+        ο καθένας έχει τον άλλον στους ΦΙΛΟΙ (σειρά γειτόνων = σειρά στη λίστα του sid).
+        """
+        friend_sets = [set(s.friends) for s in self.people]
+        graph: List[Dict[int, None]] = [{} for _ in self.people]
+        for sid, s in enumerate(self.people):
+            for friend_name in s.friends:
+                fid = self.name_to_id.get(friend_name)
+                if fid is not None and fid != sid and s.name in friend_sets[fid]:
+                    graph[sid][fid] = None
+        self.friend_graph = [list(nbrs) for nbrs in graph]
+        
+        self.friend_bits = []
+        for nbrs in self.friend_graph:
+            bits = 0
+            for fid in nbrs:
+                bits |= 1 << fid
+            self.friend_bits.append(bits)
+        
+        self.upper_friends = [[fid for fid in nbrs if fid > sid] for sid, nbrs in enumerate(self.friend_graph)]
+        
+        self.friends_indptr, self.friends_idx = self._to_csr(self.friend_graph)
+        self.upper_indptr, self.upper_idx = self._to_csr(self.upper_friends)
+    
+    @staticmethod
+    def _to_csr(adjacency: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Λίστες γειτόνων → CSR (indptr, idx) για τα kernels."""
+        indptr = np.zeros(len(adjacency) + 1, dtype=np.int64)
+        np.cumsum([len(nbrs) for nbrs in adjacency], out=indptr[1:])
+        idx = np.fromiter(chain.from_iterable(adjacency), dtype=np.int32, count=int(indptr[-1]))
+        return indptr, idx
+    
+    def _profile(self, sid: int) -> Tuple[int, int]:
+        """(φύλο, γνώση ελληνικών) μαθητή ως int codes - κλειδί για strict matching."""
+        return self.profiles[sid]
+    
+    def _bucket_by_profile(self, ids: Tuple[int, ...]) -> Dict[Tuple[int, int], List[int]]:
+        """Ομαδοποίηση solos ανά (φύλο, γνώση ελληνικών), με διατήρηση σειράς."""
+        buckets = defaultdict(list)
+        for sid in ids:
+            buckets[self._profile(sid)].append(sid)
+        return buckets
+    
+    def _match_strict_matrix(self, pairs_from: np.ndarray, pairs_to: np.ndarray) -> np.ndarray:
+        """
+        Strict match (gender + greek) όλων των pairs (P1, 2) × (P2, 2) → bool (P1, P2).
+        Ίδιο κριτήριο με τα profiles: ίδιο φύλο και γνώση ελληνικών θέση προς θέση (a με a, b με b).
+        """
+        pairs_from = np.asarray(pairs_from, dtype=np.int64).reshape(-1, 2)
+        pairs_to = np.asarray(pairs_to, dtype=np.int64).reshape(-1, 2)
+        match = np.ones((pairs_from.shape[0], pairs_to.shape[0]), dtype=np.bool_)
+        for attr in (self.gender_arr, self.greek_arr):
+            for col in (0, 1):
+                match &= attr[pairs_from[:, col]][:, None] == attr[pairs_to[:, col]][None, :]
+        return match
     
     # ==================== IMPROVEMENT COMPUTATION ====================
     
-    def _compute_improvement_k1(self, from_team: str, students_out: List[str],
-                                  to_team: str, students_in: List[str]) -> Dict:
+    def _main_delta(self, choice: int, students_out: Tuple[int, ...], students_in: Tuple[int, ...]) -> int:
+        """Μεταβολή του πλήθους EP{choice} στο from_team (0 ⇒ το swap δεν μπορεί να βελτιώσει)."""
+        people = self.people
+        return (sum(1 for sid in students_in if people[sid].choice == choice)
+                - sum(1 for sid in students_out if people[sid].choice == choice))
+    
+    def _compute_improvement_k1(self, from_team: str, students_out: List[int],
+                                  to_team: str, students_in: List[int]) -> Dict:
         """Compute improvement για K1 swap (EP1 metric)."""
-        # Snapshot before
-        stats_before = self._get_team_stats()
-        spreads_before = self._calculate_spreads()
-        ep1_before = {tn: self._count_choice(tn, 1) for tn in self.teams}
-        spread_ep1_before = max(ep1_before.values()) - min(ep1_before.values())
-        excess_teams_before = sum(1 for cnt in ep1_before.values() if cnt > self.target_ep1)
-        total_excess_before = sum(max(0, cnt - self.target_ep1) for cnt in ep1_before.values())
-        
-        # Simulate swap
-        for name in students_out:
-            self.teams[from_team].remove(name)
-            self.teams[to_team].append(name)
-        for name in students_in:
-            self.teams[to_team].remove(name)
-            self.teams[from_team].append(name)
-        
-        # Snapshot after
-        stats_after = self._get_team_stats()
-        spreads_after = self._calculate_spreads()
-        ep1_after = {tn: self._count_choice(tn, 1) for tn in self.teams}
-        spread_ep1_after = max(ep1_after.values()) - min(ep1_after.values())
-        excess_teams_after = sum(1 for cnt in ep1_after.values() if cnt > self.target_ep1)
-        total_excess_after = sum(max(0, cnt - self.target_ep1) for cnt in ep1_after.values())
-        
-        # Undo swap
-        for name in students_out:
-            self.teams[to_team].remove(name)
-            self.teams[from_team].append(name)
-        for name in students_in:
-            self.teams[from_team].remove(name)
-            self.teams[to_team].append(name)
+        return self._compute_improvement(1, self.target_ep1, from_team, students_out, to_team, students_in)
+    
+    def _compute_improvement_k2(self, from_team: str, students_out: List[int],
+                                  to_team: str, students_in: List[int]) -> Dict:
+        """Compute improvement για K2 swap (EP5 metric)."""
+        return self._compute_improvement(5, self.target_ep5, from_team, students_out, to_team, students_in)
+    
+    def _compute_improvement(self, choice: int, target: int, from_team: str, students_out: List[int],
+                             to_team: str, students_in: List[int]) -> Dict:
+        """
+        Improvement ενός υποψήφιου swap χωρίς προσομοίωση: το swap αλλάζει μόνο
+        τα δύο τμήματα, οπότε τα νέα spreads προκύπτουν από τα deltas τους.
+        """
+        # Delta ανά metric από τη σκοπιά του from_team (το to_team παίρνει το αντίθετο)
+        delta = defaultdict(int)
+        for sid in students_in:
+            for metric in self.metric_keys[sid]:
+                delta[metric] += 1
+        for sid in students_out:
+            for metric in self.metric_keys[sid]:
+                delta[metric] -= 1
+        
+        main = f'ep{choice}'
+        vals = self._metric_snapshot()[main][0]
+        from_before = vals[self.team_index[from_team]]
+        to_before = vals[self.team_index[to_team]]
+        
+        spread_greek_after = self._projected_spread('greek_yes', from_team, to_team, delta['greek_yes'])
         
         # Compute deltas
-        delta_spread_ep1 = spread_ep1_before - spread_ep1_after
-        delta_excess_teams = excess_teams_before - excess_teams_after
-        delta_total_excess = total_excess_before - total_excess_after
-        delta_boys = spreads_before['boys'] - spreads_after['boys']
-        delta_girls = spreads_before['girls'] - spreads_after['girls']
-        delta_greek = spreads_before['greek_yes'] - spreads_after['greek_yes']
-        
-        improves = (
-            delta_spread_ep1 > 0 or
-            (delta_spread_ep1 == 0 and delta_excess_teams > 0) or
-            (delta_spread_ep1 == 0 and delta_excess_teams == 0 and delta_total_excess > 0)
-        )
+        delta_spread_main = self._current_spread(main) - self._projected_spread(main, from_team, to_team, delta[main])
+        # Excess αλλάζει μόνο στα δύο τμήματα του swap
+        improves, delta_excess_teams, delta_total_excess = _swap_improves(
+            delta_spread_main, from_before, to_before, from_before + delta[main], to_before - delta[main], target)
+        delta_boys = self._current_spread('boys') - self._projected_spread('boys', from_team, to_team, delta['boys'])
+        delta_girls = self._current_spread('girls') - self._projected_spread('girls', from_team, to_team, delta['girls'])
+        delta_greek = self._current_spread('greek_yes') - spread_greek_after
         
         return {
             'improves': improves,
-            'delta_spread_ep1': delta_spread_ep1,
+            f'delta_spread_{main}': delta_spread_main,
             'delta_excess_teams': delta_excess_teams,
             'delta_total_excess': delta_total_excess,
             'delta_boys': delta_boys,
             'delta_girls': delta_girls,
             'delta_greek': delta_greek,
-            'spread_greek_after': spreads_after['greek_yes']
+            'spread_greek_after': spread_greek_after
         }
     
-    def _compute_improvement_k2(self, from_team: str, students_out: List[str],
-                                  to_team: str, students_in: List[str]) -> Dict:
-        """Compute improvement για K2 swap (EP5 metric)."""
-        # Snapshot before
-        stats_before = self._get_team_stats()
-        spreads_before = self._calculate_spreads()
-        ep5_before = {tn: self._count_choice(tn, 5) for tn in self.teams}
-        spread_ep5_before = max(ep5_before.values()) - min(ep5_before.values())
-        excess_teams_before = sum(1 for cnt in ep5_before.values() if cnt > self.target_ep5)
-        total_excess_before = sum(max(0, cnt - self.target_ep5) for cnt in ep5_before.values())
-        
-        # Simulate
-        for name in students_out:
-            self.teams[from_team].remove(name)
-            self.teams[to_team].append(name)
-        for name in students_in:
-            self.teams[to_team].remove(name)
-            self.teams[from_team].append(name)
-        
-        # Snapshot after
-        stats_after = self._get_team_stats()
-        spreads_after = self._calculate_spreads()
-        ep5_after = {tn: self._count_choice(tn, 5) for tn in self.teams}
-        spread_ep5_after = max(ep5_after.values()) - min(ep5_after.values())
-        excess_teams_after = sum(1 for cnt in ep5_after.values() if cnt > self.target_ep5)
-        total_excess_after = sum(max(0, cnt - self.target_ep5) for cnt in ep5_after.values())
-        
-        # Undo
-        for name in students_out:
-            self.teams[to_team].remove(name)
-            self.teams[from_team].append(name)
-        for name in students_in:
-            self.teams[from_team].remove(name)
-            self.teams[to_team].append(name)
-        
-        # Deltas
-        delta_spread_ep5 = spread_ep5_before - spread_ep5_after
-        delta_excess_teams = excess_teams_before - excess_teams_after
-        delta_total_excess = total_excess_before - total_excess_after
-        delta_boys = spreads_before['boys'] - spreads_after['boys']
-        delta_girls = spreads_before['girls'] - spreads_after['girls']
-        delta_greek = spreads_before['greek_yes'] - spreads_after['greek_yes']
-        
-        improves = (
-            delta_spread_ep5 > 0 or
-            (delta_spread_ep5 == 0 and delta_excess_teams > 0) or
-            (delta_spread_ep5 == 0 and delta_excess_teams == 0 and delta_total_excess > 0)
-        )
-        
-        return {
-            'improves': improves,
-            'delta_spread_ep5': delta_spread_ep5,
-            'delta_excess_teams': delta_excess_teams,
-            'delta_total_excess': delta_total_excess,
-            'delta_boys': delta_boys,
-            'delta_girls': delta_girls,
-            'delta_greek': delta_greek,
-            'spread_greek_after': spreads_after['greek_yes']
-        }
+    def _memoized(self, key: str, compute):
+        """Αποτέλεσμα του compute() για το τρέχον _state_version (ένας υπολογισμός ανά version)."""
+        entry = self._memo.get(key)
+        if entry is None or entry[0] != self._state_version:
+            entry = (self._state_version, compute())
+            self._memo[key] = entry
+        return entry[1]
     
-    def _select_best_swap(self, candidates: List[SwapRecord], main_metric: str) -> Optional[SwapRecord]:
-        """Select best swap using lexicographic scoring."""
-        if not candidates:
-            return None
-        
-        def score(swap: SwapRecord):
-            return (
-                -swap.priority,
-                swap.delta_main,
-                swap.delta_gender,
-                swap.delta_greek,
-                -len(swap.students_out)  # fewer moves
-            )
+    def _metric_snapshot(self) -> Dict[str, Tuple[List[int], List[int]]]:
+        """Counts ανά τμήμα + σειρά τμημάτων (αύξουσα) για κάθε metric, cached μέχρι το επόμενο swap."""
+        return self._memoized('snapshot', self._build_snapshot)
+    
+    def _build_snapshot(self) -> Dict[str, Tuple[List[int], List[int]]]:
+        """Υπολογισμός του snapshot από τους counters."""
+        snapshot = {}
+        for metric, vals in zip(METRIC_NAMES, self.counts_arr.T.tolist()):
+            snapshot[metric] = (vals, sorted(range(len(vals)), key=vals.__getitem__))
+        return snapshot
+    
+    def _current_spread(self, metric: str) -> int:
+        """Τρέχον spread (max - min) ενός metric."""
+        vals, order = self._metric_snapshot()[metric]
+        return vals[order[-1]] - vals[order[0]]
+    
+    def _projected_spread(self, metric: str, from_team: str, to_team: str, delta: int) -> int:
+        """Spread ενός metric αν το from_team αλλάξει κατά delta και το to_team κατά -delta."""
+        vals, order = self._metric_snapshot()[metric]
+        i, j = self.team_index[from_team], self.team_index[to_team]
+        new_i, new_j = vals[i] + delta, vals[j] - delta
+        hi, lo = max(new_i, new_j), min(new_i, new_j)
+        
+        # Extrema των υπόλοιπων τμημάτων: το πολύ 3 βήματα σε κάθε άκρο
+        for t in reversed(order):
+            if t != i and t != j:
+                hi = max(hi, vals[t])
+                break
+        for t in order:
+            if t != i and t != j:
+                lo = min(lo, vals[t])
+                break
+        return hi - lo
+    
+    def _select_best_swap(self, candidates: Iterable[SwapRecord], main_metric: str) -> Optional[SwapRecord]:
+        """
+        Select best swap using lexicographic scoring.
         
-        candidates.sort(key=score, reverse=True)
-        return candidates[0]
+        Τα candidates έρχονται σε σειρά priority (1 → 3) και η priority κυριαρχεί
+        στο score: μόλις εμφανιστεί χειρότερη priority από το best, σταματάμε.
+        Σε ισοβαθμία κρατείται ο πρώτος υποψήφιος.
+        """
+        best = None
+        for swap in candidates:
+            if best is None:
+                best = swap
+            elif swap.priority > best.priority:
+                break
+            elif swap.score_key > best.score_key:
+                best = swap
+        return best
     
     def _apply_swap(self, swap: SwapRecord) -> None:
         """Apply swap."""
-        for name in swap.students_out:
-            self.teams[swap.from_team].remove(name)
-            self.teams[swap.to_team].append(name)
-        for name in swap.students_in:
-            self.teams[swap.to_team].remove(name)
-            self.teams[swap.from_team].append(name)
-    
-    def _undo_swap(self, swap: SwapRecord) -> None:
-        """Undo swap."""
-        for name in swap.students_out:
-            self.teams[swap.to_team].remove(name)
-            self.teams[swap.from_team].append(name)
-        for name in swap.students_in:
-            self.teams[swap.from_team].remove(name)
-            self.teams[swap.to_team].append(name)
+        self._move_students(swap.students_out, swap.from_team, swap.to_team)
+        self._move_students(swap.students_in, swap.to_team, swap.from_team)
+        self._rebuild_team_indices(swap.from_team)
+        self._rebuild_team_indices(swap.to_team)
+    
+    def _move_students(self, ids: List[int], src: str, dst: str) -> None:
+        """Μετακίνηση μαθητών (ids) src → dst με ενημέρωση των counters."""
+        self._apply_delta(src, ids, -1)
+        self._apply_delta(dst, ids, +1)
+        for sid in ids:
+            name = self.id_to_name[sid]
+            del self.teams[src][name]
+            self.teams[dst][name] = None
+            bit = 1 << sid
+            self.team_bits[src] &= ~bit
+            self.team_bits[dst] |= bit
+            s = self.people[sid]
+            if not s.locked:
+                self.unlocked_by_team[src].discard(sid)
+                self.unlocked_by_team[dst].add(sid)
+                self.unlocked_by_team_choice[(src, s.choice)].discard(sid)
+                self.unlocked_by_team_choice[(dst, s.choice)].add(sid)
+        self.team_arr[ids] = self.team_index[dst]
+        self._state_version += 1
+        self._update_extrema(src, dst)
     
     # ==================== UTILITIES ====================
     
+    def _apply_delta(self, team: str, ids: List[int], sign: int) -> None:
+        """Ενημέρωση της γραμμής του team στο counts_arr για μαθητές που μπαίνουν (+1) ή βγαίνουν (-1)."""
+        self.counts_arr[self.team_index[team]] += sign * self.metric_rows[ids].sum(axis=0)
+    
+    def _rebuild_counters(self) -> None:
+        """Αρχικοποίηση counts_arr (ένα bincount ανά metric) και team_bits."""
+        metric_counts = self._metric_counts()
+        self.counts_arr = np.stack([metric_counts[metric] for metric in METRIC_NAMES], axis=1).astype(np.int32)
+        self.team_bits = dict.fromkeys(self.team_names, 0)
+        for sid, idx in enumerate(self.team_arr.tolist()):
+            self.team_bits[self.team_names[idx]] |= 1 << sid
+        self._extrema = {}
+        self._state_version += 1
+    
+    def _rebuild_unlocked(self) -> None:
+        """unlocked_by_team(_choice) από team_arr/locked_arr (μετά το load και το freeze)."""
+        self.unlocked_by_team = {tn: set() for tn in self.team_names}
+        self.unlocked_by_team_choice = {(tn, c): set() for tn in self.team_names for c in range(1, 6)}
+        for sid in np.flatnonzero(~self.locked_arr).tolist():
+            tn = self.team_names[self.team_arr[sid]]
+            self.unlocked_by_team[tn].add(sid)
+            self.unlocked_by_team_choice[(tn, self.people[sid].choice)].add(sid)
+    
+    def _extreme_teams(self, choice: int) -> Tuple[str, str]:
+        """
+        (max_team, min_team) για το choice, cached. Ίδιο tie-break με
+        max/min(counts, key=counts.get): το πρώτο τμήμα στη σειρά team_names.
+        """
+        ext = self._extrema.get(choice)
+        if ext is None:
+            counts = self._choice_counts(choice)
+            ext = (max(counts, key=counts.get), min(counts, key=counts.get))
+            self._extrema[choice] = ext
+        elif self.debug_counters:
+            counts = self._choice_counts(choice)
+            assert ext == (max(counts, key=counts.get), min(counts, key=counts.get)), \
+                f"extrema εκτός συγχρονισμού για EP{choice}"
+        return ext
+    
+    def _update_extrema(self, src: str, dst: str) -> None:
+        """Ενημέρωση cached extrema μετά από μετακίνηση src → dst (rescan μόνο αν άλλαξε ένα άκρο)."""
+        for choice, (max_team, min_team) in list(self._extrema.items()):
+            if max_team in (src, dst) or min_team in (src, dst):
+                del self._extrema[choice]
+                continue
+            vals = self.counts_arr[:, METRIC_COL[f'ep{choice}']].tolist()
+            for tn in (src, dst):
+                idx = self.team_index[tn]
+                cnt = vals[idx]
+                hi = vals[self.team_index[max_team]]
+                lo = vals[self.team_index[min_team]]
+                if cnt > hi or (cnt == hi and idx < self.team_index[max_team]):
+                    max_team = tn
+                if cnt < lo or (cnt == lo and idx < self.team_index[min_team]):
+                    min_team = tn
+            self._extrema[choice] = (max_team, min_team)
+    
+    def _choice_counts(self, choice: int) -> Dict[str, int]:
+        """Πλήθος μαθητών με επίδοση = choice ανά τμήμα (από τους counters)."""
+        counts = dict(zip(self.team_names, self.counts_arr[:, METRIC_COL[f'ep{choice}']].tolist()))
+        if self.debug_counters:
+            for tn, cnt in counts.items():
+                assert cnt == self._count_choice(tn, choice), f"counts εκτός συγχρονισμού για {tn}"
+        return counts
+    
     def _count_choice(self, team: str, choice: int) -> int:
-        """Count students με επίδοση = choice."""
-        return sum(1 for name in self.teams[team] if self.students[name].choice == choice)
+        """Count students με επίδοση = choice (γραμμική σάρωση, μόνο για debug έλεγχο)."""
+        members = self.team_arr == self.team_index[team]
+        return int(np.count_nonzero(self.choice_arr[members] == choice))
     
-    def _get_team_stats(self) -> Dict:
-        """Get stats για όλα τα τμήματα."""
-        stats = {}
-        for tn in self.teams:
-            boys = sum(1 for name in self.teams[tn] if self.students[name].gender == 'Α')
-            girls = sum(1 for name in self.teams[tn] if self.students[name].gender == 'Κ')
-            greek_yes = sum(1 for name in self.teams[tn] if self.students[name].greek_knowledge == 'Ν')
-            ep1 = self._count_choice(tn, 1)
-            ep2 = self._count_choice(tn, 2)
-            ep3 = self._count_choice(tn, 3)
-            ep4 = self._count_choice(tn, 4)
-            ep5 = self._count_choice(tn, 5)
-            
-            stats[tn] = {
-                'boys': boys,
-                'girls': girls,
-                'greek_yes': greek_yes,
-                'ep1': ep1,
-                'ep2': ep2,
-                'ep3': ep3,
-                'ep4': ep4,
-                'ep5': ep5
-            }
-        return stats
+    @staticmethod
+    def _gender_codes(people: List[Student]) -> List[int]:
+        """
+        Int κωδικός φύλου ανά μαθητή. Κάθε άγνωστη τιμή (π.χ. '' ή 'X') παίρνει δικό της κωδικό,
+        ώστε δύο διαφορετικές άκυρες τιμές να μη θεωρούνται ίδιο φύλο στο strict matching.
+        """
+        codes = dict(_GENDER_CODE)
+        return [codes.setdefault(s.gender, len(codes)) for s in people]
     
-    def _calculate_spreads(self) -> Dict[str, int]:
-        """Calculate spreads για όλα τα metrics."""
-        stats = self._get_team_stats()
-        
-        boys = [s['boys'] for s in stats.values()]
-        girls = [s['girls'] for s in stats.values()]
-        greek_yes = [s['greek_yes'] for s in stats.values()]
-        ep1 = [s['ep1'] for s in stats.values()]
-        ep2 = [s['ep2'] for s in stats.values()]
-        ep3 = [s['ep3'] for s in stats.values()]
-        ep4 = [s['ep4'] for s in stats.values()]
-        ep5 = [s['ep5'] for s in stats.values()]
-        
-        return {
-            'boys': max(boys) - min(boys),
-            'girls': max(girls) - min(girls),
-            'greek_yes': max(greek_yes) - min(greek_yes),
-            'ep1': max(ep1) - min(ep1),
-            'ep2': max(ep2) - min(ep2),
-            'ep3': max(ep3) - min(ep3),
-            'ep4': max(ep4) - min(ep4),
-            'ep5': max(ep5) - min(ep5)
+    def _build_arrays(self) -> None:
+        """Κατασκευή SoA arrays (choice/gender/greek/team) από self.teams."""
+        self.team_names = list(self.teams)
+        self.team_index = {tn: i for i, tn in enumerate(self.team_names)}
+        self.name_to_id = {}
+        self.id_to_name = []
+        team_ids = []
+        for tn, names in self.teams.items():
+            for name in names:
+                if name in self.name_to_id:
+                    continue
+                self.name_to_id[name] = len(self.id_to_name)
+                self.id_to_name.append(name)
+                team_ids.append(self.team_index[tn])
+        
+        people = self.people = [self.students[name] for name in self.id_to_name]
+        self.choice_arr = np.array([s.choice for s in people], dtype=np.int8)
+        self.gender_arr = np.array(self._gender_codes(people), dtype=np.int8)
+        self.greek_arr = np.array([_GREEK_CODE.get(s.greek_knowledge, 0) for s in people], dtype=np.int8)
+        self.profiles = list(zip(self.gender_arr.tolist(), self.greek_arr.tolist()))
+        self.team_arr = np.array(team_ids, dtype=np.int8)
+        self.locked_arr = np.array([s.locked for s in people], dtype=np.bool_)
+        
+        # Τα attributes δεν αλλάζουν με τα swaps: masks μία φορά, όχι σε κάθε iteration
+        self.metric_masks = {
+            'boys': self.gender_arr == 0,
+            'girls': self.gender_arr == 1,
+            'greek_yes': self.greek_arr == 1,
         }
+        for choice in range(1, 6):
+            self.metric_masks[f'ep{choice}'] = self.choice_arr == choice
+        self._choice_masks = {}
+        self.metric_rows = np.stack([self.metric_masks[metric] for metric in METRIC_NAMES],
+                                    axis=1).astype(np.int32)
+        
+        self.metric_keys = []
+        for choice, (gender, greek) in zip(self.choice_arr.tolist(), self.profiles):
+            keys = [f'ep{choice}']
+            if gender == 0:
+                keys.append('boys')
+            elif gender == 1:
+                keys.append('girls')
+            if greek == 1:
+                keys.append('greek_yes')
+            self.metric_keys.append(tuple(keys))
+    
+    def _metric_counts(self) -> Dict[str, np.ndarray]:
+        """Πλήθος ανά τμήμα για κάθε metric (np.bincount πάνω στο team_arr, πλήρης επανυπολογισμός)."""
+        num_teams = len(self.team_names)
+        team_arr = self.team_arr
+        return {metric: np.bincount(team_arr[mask], minlength=num_teams)
+                for metric, mask in self.metric_masks.items()}
+    
+    def _calculate_spreads(self) -> Dict[str, int]:
+        """Calculate spreads για όλα τα metrics (np.ptp ανά στήλη του counts_arr, memoized ανά version)."""
+        return self._memoized('spreads', lambda: dict(zip(METRIC_NAMES, np.ptp(self.counts_arr, axis=0).tolist())))
     
     def calculate_spreads(self) -> Dict[str, int]:
-        """Public wrapper για _calculate_spreads - συμβατότητα με app.py"""
-        return self._calculate_spreads()
+        """Public wrapper για _calculate_spreads - συμβατότητα με app.py (αντίγραφο του cached dict)"""
+        return dict(self._calculate_spreads())
     
     # ==================== EXPORT ====================
     
@@ -992,6 +1520,7 @@ class UnifiedProcessor:
         """Export optimized results to Excel."""
         wb = Workbook()
         wb.remove(wb.active)
+        self._register_styles(wb)
         
         # Team sheets
         for tn in sorted(self.teams.keys()):
@@ -1019,25 +1548,30 @@ class UnifiedProcessor:
         # Το app περνάει swaps και spreads_after αλλά η export_results τα έχει ήδη
         self.export_results(output_path)
     
+    def _register_styles(self, wb: Workbook) -> None:
+        """Named styles για τα headers, μία φορά ανά workbook (αντί για Font/PatternFill ανά κελί)."""
+        for name, fill in (('hdr', HDR_FILL_BLUE), ('hdr_perf', HDR_FILL_GREEN)):
+            wb.add_named_style(NamedStyle(name=name, font=HDR_FONT, fill=fill, alignment=CENTER))
+    
+    def _append_header(self, ws: Worksheet, headers: List[str], style: str = 'hdr') -> None:
+        """Header row με ws.append + named style στα κελιά του."""
+        ws.append(headers)
+        row_idx = ws.max_row
+        for col_idx in range(1, len(headers) + 1):
+            ws.cell(row_idx, col_idx).style = style
+    
+    def _names_str(self, ids: List[int]) -> str:
+        """Student ids → ονόματα για logging/export."""
+        return ', '.join(self.id_to_name[sid] for sid in ids)
+    
     def _write_team_sheet(self, ws: Worksheet, team_name: str) -> None:
         """Write team sheet."""
-        headers = ['ΟΝΟΜΑ', 'ΦΥΛΟ', 'ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ', 'ΕΠΙΔΟΣΗ', 'ΦΙΛΟΙ']
-        
-        # Headers
-        for col_idx, hdr in enumerate(headers, start=1):
-            cell = ws.cell(1, col_idx, hdr)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.alignment = Alignment(horizontal='center')
+        self._append_header(ws, ['ΟΝΟΜΑ', 'ΦΥΛΟ', 'ΚΑΛΗ_ΓΝΩΣΗ_ΕΛΛΗΝΙΚΩΝ', 'ΕΠΙΔΟΣΗ', 'ΦΙΛΟΙ'])
         
         # Data
-        for row_idx, name in enumerate(self.teams[team_name], start=2):
+        for name in self.teams[team_name]:
             s = self.students[name]
-            ws.cell(row_idx, 1, s.name)
-            ws.cell(row_idx, 2, s.gender)
-            ws.cell(row_idx, 3, s.greek_knowledge)
-            ws.cell(row_idx, 4, s.choice)
-            ws.cell(row_idx, 5, ', '.join(s.friends))
+            ws.append([s.name, s.gender, s.greek_knowledge, s.choice, ', '.join(s.friends)])
         
         # Adjust widths
         ws.column_dimensions['A'].width = 30
@@ -1051,11 +1585,7 @@ class UnifiedProcessor:
         spreads = self._calculate_spreads()
         
         # ===== SECTION 1: SPREADS =====
-        headers = ['Metric', 'Value', 'Target', 'Status']
-        for col_idx, hdr in enumerate(headers, start=1):
-            cell = ws.cell(1, col_idx, hdr)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        self._append_header(ws, ['Metric', 'Value', 'Target', 'Status'])
         
         rows = [
             ('Spread High Perf (EP1)', spreads['ep1'], f"≤ {self.spread_ep1_goal}"),
@@ -1065,11 +1595,7 @@ class UnifiedProcessor:
             ('Spread Greek', spreads['greek_yes'], '≤ 4'),
         ]
         
-        for row_idx, (metric, value, target) in enumerate(rows, start=2):
-            ws.cell(row_idx, 1, metric)
-            ws.cell(row_idx, 2, value)
-            ws.cell(row_idx, 3, target)
-            
+        for metric, value, target in rows:
             # Status
             if 'EP1' in metric:
                 ok = value <= self.spread_ep1_goal
@@ -1078,54 +1604,22 @@ class UnifiedProcessor:
             else:
                 ok = value <= 4
             
-            status = '✅' if ok else '❌'
-            cell = ws.cell(row_idx, 4, status)
-            if ok:
-                cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            else:
-                cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+            ws.append([metric, value, target, '✅' if ok else '❌'])
+            ws.cell(ws.max_row, 4).fill = OK_FILL if ok else BAD_FILL
         
         # ===== SECTION 2: ΠΙΝΑΚΑΣ ΕΠΙΔΟΣΕΩΝ ΑΝΑ ΤΜΗΜΑ =====
-        start_row = len(rows) + 3  # Κενή γραμμή + header
+        ws.append([])  # Κενή γραμμή
         
         # Headers πίνακα
-        perf_headers = ['Τμήμα', 'Σύνολο', 'Αγόρια', 'Κορίτσια', 
-                        'Γνώση (ΝΑΙ)', 'Γνώση (ΟΧΙ)', 
-                        'Επ1', 'Επ2', 'Επ3', 'Επ4', 'Επ5']
-        
-        for col_idx, hdr in enumerate(perf_headers, start=1):
-            cell = ws.cell(start_row, col_idx, hdr)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
-            cell.alignment = Alignment(horizontal='center')
+        self._append_header(ws, ['Τμήμα', 'Σύνολο', 'Αγόρια', 'Κορίτσια',
+                                 'Γνώση (ΝΑΙ)', 'Γνώση (ΟΧΙ)',
+                                 'Επ1', 'Επ2', 'Επ3', 'Επ4', 'Επ5'], style='hdr_perf')
         
         # Data ανά τμήμα
-        for row_offset, team_name in enumerate(sorted(self.teams.keys()), start=1):
-            row_idx = start_row + row_offset
-            
-            total = len(self.teams[team_name])
-            boys = sum(1 for name in self.teams[team_name] if self.students[name].gender == 'Α')
-            girls = sum(1 for name in self.teams[team_name] if self.students[name].gender == 'Κ')
-            greek_yes = sum(1 for name in self.teams[team_name] if self.students[name].greek_knowledge == 'Ν')
-            greek_no = sum(1 for name in self.teams[team_name] if self.students[name].greek_knowledge == 'Ο')
-            
-            ep1 = self._count_choice(team_name, 1)
-            ep2 = self._count_choice(team_name, 2)
-            ep3 = self._count_choice(team_name, 3)
-            ep4 = self._count_choice(team_name, 4)
-            ep5 = self._count_choice(team_name, 5)
-            
-            ws.cell(row_idx, 1, team_name)
-            ws.cell(row_idx, 2, total)
-            ws.cell(row_idx, 3, boys)
-            ws.cell(row_idx, 4, girls)
-            ws.cell(row_idx, 5, greek_yes)
-            ws.cell(row_idx, 6, greek_no)
-            ws.cell(row_idx, 7, ep1)
-            ws.cell(row_idx, 8, ep2)
-            ws.cell(row_idx, 9, ep3)
-            ws.cell(row_idx, 10, ep4)
-            ws.cell(row_idx, 11, ep5)
+        for team_name in sorted(self.teams.keys()):
+            summary = self._team_summary(team_name)
+            ws.append([team_name] + [summary[key] for key in (
+                'total', 'boys', 'girls', 'greek_yes', 'greek_no', 'ep1', 'ep2', 'ep3', 'ep4', 'ep5')])
         
         # Column widths
         ws.column_dimensions['A'].width = 30
@@ -1140,27 +1634,22 @@ class UnifiedProcessor:
         ws.column_dimensions['J'].width = 8
         ws.column_dimensions['K'].width = 8
     
+    def _team_summary(self, team_name: str) -> Dict[str, int]:
+        """Όλα τα πλήθη του τμήματος από τη γραμμή του counts_arr, χωρίς σάρωση των μαθητών."""
+        summary = dict(zip(METRIC_NAMES, self.counts_arr[self.team_index[team_name]].tolist()))
+        summary['total'] = len(self.teams[team_name])
+        # Στα filled data η γνώση ελληνικών είναι πάντα Ν ή Ο
+        summary['greek_no'] = summary['total'] - summary['greek_yes']
+        return summary
+    
     def _write_swaps_sheet(self, ws: Worksheet, swaps: List[SwapRecord]) -> None:
         """Write swaps log sheet."""
-        headers = ['#', 'Type', 'From', 'OUT', 'To', 'IN', 'Δ_main', 'Δ_gender', 'Δ_greek', 'Priority']
-        
-        for col_idx, hdr in enumerate(headers, start=1):
-            cell = ws.cell(1, col_idx, hdr)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.alignment = Alignment(horizontal='center')
-        
-        for row_idx, swap in enumerate(swaps, start=2):
-            ws.cell(row_idx, 1, row_idx - 1)
-            ws.cell(row_idx, 2, swap.swap_type)
-            ws.cell(row_idx, 3, swap.from_team)
-            ws.cell(row_idx, 4, ', '.join(swap.students_out))
-            ws.cell(row_idx, 5, swap.to_team)
-            ws.cell(row_idx, 6, ', '.join(swap.students_in))
-            ws.cell(row_idx, 7, swap.delta_main)
-            ws.cell(row_idx, 8, swap.delta_gender)
-            ws.cell(row_idx, 9, swap.delta_greek)
-            ws.cell(row_idx, 10, swap.priority)
+        self._append_header(ws, ['#', 'Type', 'From', 'OUT', 'To', 'IN', 'Δ_main', 'Δ_gender', 'Δ_greek', 'Priority'])
+        
+        for num, swap in enumerate(swaps, start=1):
+            ws.append([num, swap.swap_type, swap.from_team, self._names_str(swap.students_out),
+                       swap.to_team, self._names_str(swap.students_in),
+                       swap.delta_main, swap.delta_gender, swap.delta_greek, swap.priority])
         
         ws.column_dimensions['A'].width = 5
         ws.column_dimensions['B'].width = 30
@@ -1178,19 +1667,12 @@ class UnifiedProcessor:
     def _parse_headers(self, sheet: Worksheet) -> Dict[str, int]:
         """Parse headers from Excel sheet."""
         headers = {}
-        for col_idx in range(1, sheet.max_column + 1):
-            cell_val = sheet.cell(1, col_idx).value
+        header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        for col_idx, cell_val in enumerate(header_row, start=1):
             if cell_val:
                 normalized = str(cell_val).strip().upper().replace(' ', '_')
                 headers[normalized] = col_idx
         return headers
-    
-    def _get_cell_value(self, sheet: Worksheet, row: int, col: Optional[int]) -> str:
-        """Get cell value safely."""
-        if col is None:
-            return ""
-        val = sheet.cell(row, col).value
-        return str(val).strip() if val is not None else ""
 
 
 # ==================== CLI ====================
@@ -1210,8 +1692,10 @@ def main():
     parser.add_argument('--spread5-goal', type=int, default=1, help="Spread goal for EP5 (default: 1)")
     parser.add_argument('--max-iter-k1', type=int, default=100, help="Max iterations K1 (default: 100)")
     parser.add_argument('--max-iter-k2', type=int, default=100, help="Max iterations K2 (default: 100)")
+    parser.add_argument('--verbose', action='store_true', help="Log per-iteration progress (DEBUG)")
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format="%(message)s")
     
     processor = UnifiedProcessor()
     
@@ -1240,7 +1724,7 @@ def main():
         print("\n📋 Phase 1/3: Filling...")
         temp_filled = args.out.replace('.xlsx', '_temp_filled.xlsx')
         processor.read_source_data(args.source)
-        processor.fill_template(args.template, temp_filled)
+        processor.fill_template_fast(args.template, temp_filled)
         
         # Phase 2: Load
         print("\n📥 Phase 2/3: Loading...")